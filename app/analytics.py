@@ -0,0 +1,209 @@
+from datetime import datetime
+from typing import Iterable, Literal, Optional
+
+try:
+    import pandas as pd
+except ImportError as e:
+    raise ImportError(
+        "app.analytics requires pandas: pip install keyprod-tracking[analytics]"
+    ) from e
+from sqlalchemy import func, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import RamOption, RamPrice, RamPriceHistory, get_read_engine
+
+
+DtypeBackend = Literal["numpy_nullable", "pyarrow"]
+
+MISSING_PRICE = -99  # 抓取時缺價格的標記值，載入後轉為 NA
+
+CATEGORICAL_COLUMNS = ("category", "brand", "capacity", "speed", "latency", "status")
+
+
+def _apply_dtypes(
+    df: pd.DataFrame, dtype_backend: DtypeBackend = "numpy_nullable"
+) -> pd.DataFrame:
+    """將欄位轉為型別化 dtype：價格為可空整數、文字屬性為 category、時間為 datetime64。"""
+    if dtype_backend == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "dtype_backend='pyarrow' requires pyarrow: pip install keyprod-tracking[arrow]"
+            ) from e
+        int_dtype, bool_dtype = "int64[pyarrow]", "bool[pyarrow]"
+        str_dtype = "string[pyarrow]"
+    else:
+        int_dtype, bool_dtype, str_dtype = "Int64", "boolean", "string"
+
+    for column in df.columns:
+        if column in ("id", "ram_id"):
+            df[column] = df[column].astype(int_dtype)
+        elif column in ("price", "latest_price"):
+            df[column] = df[column].astype(int_dtype).mask(df[column] == MISSING_PRICE)
+        elif column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype("category")
+        elif column == "is_dual_channel":
+            df[column] = df[column].astype(bool_dtype)
+        elif column.endswith("_at"):
+            df[column] = pd.to_datetime(df[column])
+        elif column == "name_raw":
+            df[column] = df[column].astype(str_dtype)
+    return df
+
+
+async def _read_frame(stmt, engine: Optional[AsyncEngine]) -> pd.DataFrame:
+    engine = engine or get_read_engine()
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: pd.read_sql(stmt, sync_conn))
+
+
+async def load_catalog(
+    engine: Optional[AsyncEngine] = None,
+    dtype_backend: DtypeBackend = "numpy_nullable",
+) -> pd.DataFrame:
+    """以單一查詢載入所有 RAM 選項及其最新價格。"""
+    stmt = select(
+        RamOption.id,
+        RamOption.name_raw,
+        RamOption.category,
+        RamOption.brand,
+        RamOption.capacity,
+        RamOption.speed,
+        RamOption.latency,
+        RamOption.is_dual_channel,
+        RamPrice.price.label("latest_price"),
+        RamPrice.status,
+        RamPrice.scraped_at,
+    ).outerjoin(RamPrice, RamOption.id == RamPrice.ram_id)
+    df = await _read_frame(stmt, engine)
+    return _apply_dtypes(df, dtype_backend)
+
+
+async def load_history(
+    ram_ids: Optional[Iterable[int]] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    engine: Optional[AsyncEngine] = None,
+    dtype_backend: DtypeBackend = "numpy_nullable",
+) -> pd.DataFrame:
+    """
+    以單一查詢載入多個 SKU 的歷史價格（長格式），並附上 category 與 brand。
+    歷史表只記錄價格或狀態變動，每筆代表自該時間起的價格；每個 SKU 最後再補上
+    ram_prices 的最新快照，讓資料延伸到最近一次抓取。
+    可依 ram_ids、category 或起始時間篩選。指定 since 時，另外取出每個 SKU 在 since
+    之前的最後一筆並將時間設為 since，作為起始時仍有效的價格。
+    """
+    latest_recorded = (
+        select(func.max(RamPriceHistory.scraped_at))
+        .where(RamPriceHistory.ram_id == RamPrice.ram_id)
+        .scalar_subquery()
+    )
+    points = union_all(
+        select(
+            RamPriceHistory.ram_id,
+            RamPriceHistory.price,
+            RamPriceHistory.status,
+            RamPriceHistory.scraped_at,
+        ),
+        # 只為有歷史的 SKU 補上較新的快照
+        select(
+            RamPrice.ram_id, RamPrice.price, RamPrice.status, RamPrice.scraped_at
+        ).where(RamPrice.scraped_at > latest_recorded),
+    ).cte("points")
+    stmt = (
+        select(
+            points.c.ram_id,
+            RamOption.category,
+            RamOption.brand,
+            points.c.price,
+            points.c.status,
+            points.c.scraped_at,
+        )
+        .outerjoin(RamOption, RamOption.id == points.c.ram_id)
+        .order_by(points.c.ram_id, points.c.scraped_at)
+    )
+    if ram_ids is not None:
+        stmt = stmt.where(points.c.ram_id.in_(list(ram_ids)))
+    if category is not None:
+        stmt = stmt.where(RamOption.category == category)
+    if since is not None:
+        earlier = points.alias("earlier")
+        last_before = (
+            select(func.max(earlier.c.scraped_at))
+            .where(earlier.c.ram_id == points.c.ram_id, earlier.c.scraped_at < since)
+            .scalar_subquery()
+        )
+        stmt = stmt.where(
+            or_(points.c.scraped_at >= since, points.c.scraped_at == last_before)
+        )
+    df = _apply_dtypes(await _read_frame(stmt, engine), dtype_backend)
+    if since is not None:
+        df.loc[df["scraped_at"] < since, "scraped_at"] = pd.Timestamp(since)
+    return df
+
+
+def resample_prices(
+    history: pd.DataFrame, rule: str = "1D", how: str = "last"
+) -> pd.DataFrame:
+    """
+    將長格式歷史重新取樣為寬格式：索引為時間，欄位為 ram_id。
+    `how` 為聚合方式，例如 "last"、"min"、"mean"。
+    由於歷史只記錄變動，沒有紀錄的時段沿用前一個價格（forward fill）。
+    """
+    if history.empty:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="scraped_at"))
+    return (
+        history.set_index("scraped_at")
+        .groupby("ram_id", observed=True)["price"]
+        .resample(rule)
+        .agg(how)
+        .unstack("ram_id")
+        .ffill()
+    )
+
+
+def category_price_index(history: pd.DataFrame, rule: str = "1D") -> pd.DataFrame:
+    """
+    計算各類別的價格指數：每個 SKU 以首筆價格為 100 正規化後，取同類別的中位數。
+    回傳索引為時間、欄位為類別的 DataFrame。
+    """
+    wide = resample_prices(history, rule).astype("float64")
+    if wide.empty:
+        return wide
+    normalized = wide / wide.bfill().iloc[0] * 100
+    categories = (
+        history.drop_duplicates("ram_id")
+        .set_index("ram_id")["category"]
+        .reindex(normalized.columns)
+    )
+    return normalized.T.groupby(categories.to_numpy()).median().T
+
+
+def rolling_drawdown(
+    history: pd.DataFrame, window: str = "30D", rule: str = "1D"
+) -> pd.DataFrame:
+    """
+    計算每個 SKU 在時間視窗內的滾動最高/最低價，以及相對滾動最高價的回撤比例。
+    歷史只記錄變動，因此先以 `rule` 重新取樣並沿用前值，在等間隔的時間格上計算，
+    變動間隔超過視窗時仍能取得視窗內有效的價格。
+    """
+    columns = ["ram_id", "scraped_at", "price", "rolling_max", "rolling_min", "drawdown"]
+    wide = resample_prices(history, rule).astype("float64")
+    if wide.empty:
+        return pd.DataFrame(columns=columns)
+    rolling = wide.rolling(window)
+    rolling_max = rolling.max()
+    frames = {
+        "price": wide,
+        "rolling_max": rolling_max,
+        "rolling_min": rolling.min(),
+        "drawdown": wide / rolling_max - 1,
+    }
+    df = pd.concat(
+        {name: frame.stack(future_stack=True) for name, frame in frames.items()},
+        axis=1,
+    )
+    # 首筆紀錄之前的時間格沒有價格
+    df = df.dropna(subset=["price"]).swaplevel().sort_index().reset_index()
+    return df[columns]
@@ -0,0 +1,306 @@
+import argparse
+import sys
+
+# 僅匯入標準函式庫；SQLAlchemy、抓取與分析模組在各子命令內才匯入，
+# 讓 `keyprod --help` 等短命令維持快速啟動。
+
+# 與 app.tracking.FILTER_FIELDS 相同，於此重複定義以避免匯入 SQLAlchemy
+FILTER_FIELDS = ("category", "brand", "capacity", "speed", "latency", "is_dual_channel")
+
+
+def _run(coro):
+    import asyncio
+
+    return asyncio.run(coro)
+
+
+async def _init_db():
+    from app.database import init_db
+
+    await init_db()
+
+
+def cmd_init_db(args):
+    _run(_init_db())
+    print("Database initialized.")
+
+
+def cmd_serve(args):
+    import uvicorn
+
+    uvicorn.run("app.main:app", host=args.host, port=args.port, reload=args.reload)
+
+
+def cmd_scrape(args):
+    from app.scraper import scrape_and_store
+
+    _run(scrape_and_store())
+    print("Scraping completed.")
+
+
+async def _view(limit: int):
+    from sqlalchemy import select
+    from app.database import RamOption, RamPrice, get_read_sessionmaker
+
+    async with get_read_sessionmaker()() as session:
+        result = await session.execute(select(RamOption).limit(limit))
+        print(f"RAM Options (first {limit}):")
+        for ram in result.scalars().all():
+            print(
+                f"ID: {ram.id}, Category: {ram.category}, Name: {ram.name_raw}, Brand: {ram.brand}, Capacity: {ram.capacity}, Speed: {ram.speed}, Latency: {ram.latency}"
+            )
+
+        result = await session.execute(select(RamPrice).limit(limit))
+        print(f"\nPrices (first {limit}):")
+        for price in result.scalars().all():
+            print(
+                f"RAM ID: {price.ram_id}, Price: {price.price}, Status: {price.status}, Scraped: {price.scraped_at}"
+            )
+
+    print("Done viewing data.")
+
+
+def cmd_view(args):
+    _run(_view(args.limit))
+
+
+async def _history(ram_id: int):
+    from sqlalchemy import exists, select
+    from app.database import TrackedRam, get_read_sessionmaker
+    from app.tracking import get_track_all, load_price_points
+
+    async with get_read_sessionmaker()() as session:
+        tracked = await get_track_all(session) or await session.scalar(
+            select(exists().where(TrackedRam.ram_id == ram_id))
+        )
+        points = await load_price_points(session, ram_id)
+
+    if not tracked:
+        # Not tracked: main table holds the latest snapshot only
+        if points:
+            latest = points[-1]
+            print(f"Latest price for RAM ID {ram_id} (not tracked):")
+            print(
+                f"Date: {latest.scraped_at}, Price: {latest.price}, Status: {latest.status}"
+            )
+        else:
+            print(f"No price data for RAM ID {ram_id}")
+        return
+
+    if not points:
+        print(f"RAM ID {ram_id} is tracked but has no price data yet")
+        return
+    print(f"Tracked price history for RAM ID {ram_id}:")
+    for row in points:
+        print(f"Date: {row.scraped_at}, Price: {row.price}, Status: {row.status}")
+
+
+def cmd_history(args):
+    _run(_history(args.ram_id))
+
+
+async def _track(args):
+    from app.database import get_sessionmaker, init_db
+    from app import tracking
+
+    await init_db()
+    async with get_sessionmaker()() as session:
+        if args.command == "track-all":
+            await tracking.set_track_all(session, not args.off)
+            print(f"Track-all mode {'disabled' if args.off else 'enabled'}.")
+            return
+
+        filters = {field: getattr(args, field) for field in FILTER_FIELDS}
+        ram_ids = args.ram_ids or None
+        try:
+            if args.command == "track":
+                count = await tracking.track_rams(session, ram_ids, **filters)
+                print(f"Added {count} RAM options to tracked list.")
+            else:
+                count = await tracking.untrack_rams(session, ram_ids, **filters)
+                print(f"Removed {count} RAM options from tracked list.")
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+
+def cmd_track(args):
+    _run(_track(args))
+
+
+async def _tracking_mode():
+    from app.database import get_read_sessionmaker
+    from app.tracking import get_track_all
+
+    async with get_read_sessionmaker()() as session:
+        enabled = await get_track_all(session)
+    print(f"Track-all mode: {'on' if enabled else 'off'}")
+
+
+def cmd_tracking_mode(args):
+    _run(_tracking_mode())
+
+
+async def _analytics(args):
+    from app import analytics
+
+    dtype_backend = "pyarrow" if args.arrow else "numpy_nullable"
+    if args.report == "catalog":
+        return await analytics.load_catalog(dtype_backend=dtype_backend)
+
+    history = await analytics.load_history(
+        ram_ids=args.ram_ids,
+        category=args.category,
+        since=args.since,
+        dtype_backend=dtype_backend,
+    )
+    if args.report == "resample":
+        return analytics.resample_prices(history, args.rule)
+    if args.report == "index":
+        return analytics.category_price_index(history, args.rule)
+    if args.report == "drawdown":
+        return analytics.rolling_drawdown(history, args.window, args.rule)
+    return history
+
+
+def cmd_analytics(args):
+    if args.output is not None and args.output.endswith(".parquet"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print(
+                "Error: writing .parquet requires pyarrow: pip install keyprod-tracking[arrow]"
+            )
+            sys.exit(1)
+    df = _run(_analytics(args))
+    if args.output is None:
+        print(df.to_string())
+        return
+    if args.output.endswith(".parquet"):
+        df.to_parquet(args.output)
+    else:
+        df.to_csv(args.output)
+    print(f"Wrote {len(df)} rows to {args.output}")
+
+
+async def _update_categories():
+    from sqlalchemy import update
+    from app.database import RamOption, get_sessionmaker, init_db
+
+    await init_db()
+    async with get_sessionmaker()() as session:
+        # Update RamOption categories based on is_dual_channel
+        await session.execute(
+            update(RamOption)
+            .where(RamOption.is_dual_channel == True)
+            .values(category="DDR5 雙通")
+        )
+        await session.execute(
+            update(RamOption)
+            .where(RamOption.is_dual_channel == False)
+            .values(category="DDR5 單通")
+        )
+        await session.commit()
+    print("Updated categories.")
+
+
+def cmd_update_categories(args):
+    _run(_update_categories())
+
+
+def _add_filter_arguments(parser):
+    parser.add_argument("ram_ids", nargs="*", type=int, help="RAM IDs")
+    for field in FILTER_FIELDS:
+        if field == "is_dual_channel":
+            continue
+        parser.add_argument(f"--{field}", help=f"Filter by {field}")
+    parser.add_argument(
+        "--dual-channel",
+        dest="is_dual_channel",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Filter by dual channel",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="keyprod", description="RAM price tracking command line tools."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sub = subparsers.add_parser("init-db", help="Create tables and run migrations")
+    sub.set_defaults(func=cmd_init_db)
+
+    sub = subparsers.add_parser("serve", help="Run the API server")
+    sub.add_argument("--host", default="127.0.0.1")
+    sub.add_argument("--port", type=int, default=8000)
+    sub.add_argument("--reload", action="store_true")
+    sub.set_defaults(func=cmd_serve)
+
+    sub = subparsers.add_parser("scrape", help="Scrape and store RAM prices")
+    sub.set_defaults(func=cmd_scrape)
+
+    sub = subparsers.add_parser("view", help="Print RAM options and latest prices")
+    sub.add_argument("--limit", type=int, default=1000)
+    sub.set_defaults(func=cmd_view)
+
+    sub = subparsers.add_parser("history", help="Print price history of a RAM")
+    sub.add_argument("ram_id", type=int)
+    sub.set_defaults(func=cmd_history)
+
+    sub = subparsers.add_parser("track", help="Track RAM options by ID or filter")
+    _add_filter_arguments(sub)
+    sub.set_defaults(func=cmd_track)
+
+    sub = subparsers.add_parser("untrack", help="Untrack RAM options by ID or filter")
+    _add_filter_arguments(sub)
+    sub.set_defaults(func=cmd_track)
+
+    sub = subparsers.add_parser("track-all", help="Enable or disable track-all mode")
+    sub.add_argument("--off", action="store_true", help="Disable track-all mode")
+    sub.set_defaults(func=cmd_track)
+
+    sub = subparsers.add_parser("tracking-mode", help="Show the track-all mode")
+    sub.set_defaults(func=cmd_tracking_mode)
+
+    sub = subparsers.add_parser(
+        "analytics", help="Load catalog/history into pandas and write results"
+    )
+    sub.add_argument(
+        "report", choices=["catalog", "history", "resample", "index", "drawdown"]
+    )
+    sub.add_argument(
+        "-o", "--output", help="Output file (.csv or .parquet); prints if omitted"
+    )
+    sub.add_argument("--ram-ids", nargs="*", type=int, help="Filter by RAM IDs")
+    sub.add_argument("--category", help="Filter history by category")
+    sub.add_argument("--since", type=_parse_datetime, help="ISO start time")
+    sub.add_argument("--rule", default="1D", help="Resample rule, e.g. 1h, 1D")
+    sub.add_argument("--window", default="30D", help="Rolling window for drawdown")
+    sub.add_argument(
+        "--arrow", action="store_true", help="Use Arrow-backed dtypes (needs pyarrow)"
+    )
+    sub.set_defaults(func=cmd_analytics)
+
+    sub = subparsers.add_parser(
+        "update-categories", help="Reset categories from the dual channel flag"
+    )
+    sub.set_defaults(func=cmd_update_categories)
+
+    return parser
+
+
+def _parse_datetime(value: str):
+    from datetime import datetime
+
+    return datetime.fromisoformat(value)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import Index, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
 from typing import Optional
 from datetime import datetime
+from functools import lru_cache
+from app.storage import StorageConfig, WriteQueue, create_engines
 
 
 class Base(DeclarativeBase):
@@ -38,21 +41,161 @@ class TrackedRam(Base):
     __tablename__ = "tracked_rams"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    ram_id: Mapped[int]  # FK to RamOption.id
+    ram_id: Mapped[int] = mapped_column(
+        unique=True, index=True
+    )  # FK to RamOption.id, unique for bulk upsert
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
 
-DATABASE_URL = "sqlite+aiosqlite:///./ram_tracking.db"
+class RamPriceHistory(Base):
+    __tablename__ = "ram_price_history"
+    __table_args__ = (
+        Index("ix_ram_price_history_ram_id_scraped_at", "ram_id", "scraped_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    ram_id: Mapped[int]  # FK to RamOption.id
+    price: Mapped[int]
+    status: Mapped[str]
+    scraped_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+
+class AppSetting(Base):
+    __tablename__ = "app_settings"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    value: Mapped[str]
+
+
+# 引擎與 session 工廠在第一次使用時才建立，匯入本模組不會開啟資料庫連線。
+# 寫入引擎（單一連線）供抓取與追蹤修改使用；讀取引擎供 API 查詢使用。
+
+
+@lru_cache(maxsize=None)
+def _engines():
+    return create_engines(StorageConfig.from_env())
+
+
+def get_read_engine():
+    return _engines()[0]
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+def get_engine():
+    return _engines()[1]
 
-async def init_db():
-    async with engine.begin() as conn:
+
+@lru_cache(maxsize=None)
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(get_engine(), class_=AsyncSession, expire_on_commit=False)
+
+
+@lru_cache(maxsize=None)
+def get_read_sessionmaker() -> sessionmaker:
+    return sessionmaker(get_read_engine(), class_=AsyncSession, expire_on_commit=False)
+
+
+@lru_cache(maxsize=None)
+def get_write_queue() -> WriteQueue:
+    return WriteQueue(get_sessionmaker())
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "read_engine": get_read_engine,
+    "async_session": get_sessionmaker,
+    "read_session": get_read_sessionmaker,
+    "write_queue": get_write_queue,
+}
+
+
+def __getattr__(name):
+    # 保留 `from app.database import async_session` 等既有用法，但延遲建立
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def init_db(engine=None):
+    async with (engine or get_engine()).begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await _migrate_ram_prices(conn)
+        await _migrate_tracked_rams(conn)
+        await _migrate_legacy_track_tables(conn)
+
+
+async def _has_unique_index(conn, table_name: str, column: str) -> bool:
+    result = await conn.execute(text(f"PRAGMA index_list({table_name})"))
+    for _, index_name, unique, *_ in result.fetchall():
+        if not unique:
+            continue
+        info = await conn.execute(text(f"PRAGMA index_info('{index_name}')"))
+        if [row[2] for row in info.fetchall()] == [column]:
+            return True
+    return False
+
+
+async def _migrate_ram_prices(conn):
+    # The scraper upserts on ram_prices.ram_id, which needs a unique constraint
+    # that older databases lack; keep the latest row per ram_id, then add it.
+    if await _has_unique_index(conn, "ram_prices", "ram_id"):
+        return
+    await conn.execute(
+        text(
+            "DELETE FROM ram_prices WHERE id NOT IN "
+            "(SELECT MAX(id) FROM ram_prices GROUP BY ram_id)"
+        )
+    )
+    await conn.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_ram_prices_ram_id "
+            "ON ram_prices (ram_id)"
+        )
+    )
+
+
+async def _migrate_tracked_rams(conn):
+    # Older databases were created without the unique index on ram_id and may
+    # contain duplicates; keep the earliest row per ram_id, then add the index.
+    await conn.execute(
+        text(
+            "DELETE FROM tracked_rams WHERE id NOT IN "
+            "(SELECT MIN(id) FROM tracked_rams GROUP BY ram_id)"
+        )
+    )
+    await conn.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_tracked_rams_ram_id "
+            "ON tracked_rams (ram_id)"
+        )
+    )
+
+
+async def _migrate_legacy_track_tables(conn):
+    # Fold the old per-RAM `ram_{id}_track` tables into ram_price_history.
+    result = await conn.execute(
+        text(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND name LIKE 'ram\\_%\\_track' ESCAPE '\\'"
+        )
+    )
+    for (table_name,) in result.fetchall():
+        ram_id = table_name[len("ram_") : -len("_track")]
+        if not ram_id.isdigit():
+            continue
+        await conn.execute(
+            text(
+                "INSERT INTO ram_price_history (ram_id, price, status, scraped_at) "
+                f"SELECT {int(ram_id)}, price, status, scraped_at FROM {table_name}"
+            )
+        )
+        await conn.execute(text(f"DROP TABLE {table_name}"))
 
 
 async def get_session() -> AsyncSession:
-    async with async_session() as session:
+    async with get_sessionmaker()() as session:
+        yield session
+
+
+async def get_read_session() -> AsyncSession:
+    async with get_read_sessionmaker()() as session:
         yield session
@@ -1,9 +1,23 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
-from app.database import RamOption, RamPrice, TrackedRam, get_session, init_db
-from typing import List
+from sqlalchemy import select, func
+from app.database import (
+    RamOption,
+    RamPrice,
+    TrackedRam,
+    get_read_session,
+    get_session,
+    init_db,
+)
+from app.tracking import (
+    get_track_all,
+    load_price_points,
+    set_track_all,
+    track_rams,
+    untrack_rams,
+)
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -64,6 +78,24 @@ class ChartDataResponse(BaseModel):
     prices: List[int]
 
 
+class BulkTrackRequest(BaseModel):
+    """定義批次追蹤/取消追蹤的請求結構：指定 ram_ids 列表，或以欄位篩選"""
+
+    ram_ids: Optional[List[int]] = None
+    category: str | None = None
+    brand: str | None = None
+    capacity: str | None = None
+    speed: str | None = None
+    latency: str | None = None
+    is_dual_channel: bool | None = None
+
+
+class TrackingModeRequest(BaseModel):
+    """定義全域追蹤模式的請求/回應結構"""
+
+    track_all: bool
+
+
 # --- 應用程式生命週期事件 ---
 
 
@@ -80,11 +112,11 @@ async def startup():
 
 
 @app.get("/ram-options", response_model=List[RamOptionResponse])
-async def get_ram_options(session: AsyncSession = Depends(get_session)):
+async def get_ram_options(session: AsyncSession = Depends(get_read_session)):
     """
     獲取所有 RAM 選項及其最新的價格和狀態。
-    `session: AsyncSession = Depends(get_session)` 是 FastAPI 的依賴注入，
-    它為每個請求提供一個獨立的資料庫 session，並在請求結束後自動關閉。
+    `session: AsyncSession = Depends(get_read_session)` 是 FastAPI 的依賴注入，
+    它為每個請求提供一個獨立的唯讀資料庫 session（使用讀取連線池，不會被抓取寫入阻塞），並在請求結束後自動關閉。
     """
     # 為了效能優化，這裡使用了一個子查詢來高效地獲取每個 RAM 的最新價格。
     # 1. 建立一個子查詢 (subquery)，找出每個 ram_id 對應的最新 scraped_at 時間點的價格紀錄。
@@ -111,6 +143,7 @@ async def get_ram_options(session: AsyncSession = Depends(get_session)):
     )
 
     result = await session.execute(stmt)
+    track_all = await get_track_all(session)
 
     # 3. 將查詢結果組裝成 Pydantic 模型列表。
     rams = []
@@ -129,100 +162,118 @@ async def get_ram_options(session: AsyncSession = Depends(get_session)):
                 latest_price=row.latest_price,
                 latest_status=row.latest_status,
                 latest_scraped_at=row.latest_scraped_at,
-                is_tracked=row.tracked_id is not None,
+                is_tracked=track_all or row.tracked_id is not None,
             )
         )
     return rams
 
 
 @app.get("/ram/{ram_id}/prices", response_model=List[RamPriceResponse])
-async def get_ram_prices(ram_id: int, session: AsyncSession = Depends(get_session)):
-    """
-    根據指定的 ram_id，獲取該 RAM 的所有歷史價格紀錄。
-    若為追蹤項目，返回專屬表歷史；否則，返回最新單筆記錄。
-    """
-    # 檢查是否為追蹤項目
-    tracked = await session.get(TrackedRam, ram_id)
-    if tracked:
-        # 查詢專屬追蹤表
-        table_name = f"ram_{ram_id}_track"
-        result = await session.execute(
-            text(
-                f"SELECT price, status, scraped_at FROM {table_name} ORDER BY scraped_at"
-            )
-        )
-        rows = result.fetchall()
-        prices = [
-            RamPriceResponse(price=row[0], status=row[1], scraped_at=row[2])
-            for row in rows
-        ]
-    else:
-        # 查詢主表最新記錄
-        stmt = select(RamPrice).where(RamPrice.ram_id == ram_id)
-        result = await session.execute(stmt)
-        ram_price = result.scalar_one_or_none()
-        if ram_price:
-            prices = [
-                RamPriceResponse(
-                    price=ram_price.price,
-                    status=ram_price.status,
-                    scraped_at=ram_price.scraped_at,
-                )
-            ]
-        else:
-            prices = []
-
-    if not prices:
+async def get_ram_prices(
+    ram_id: int, session: AsyncSession = Depends(get_read_session)
+):
+    """
+    根據指定的 ram_id，獲取該 RAM 的歷史價格紀錄。
+    若有累積歷史（追蹤項目或全部追蹤模式），返回各次價格變動與最新快照；否則，返回最新單筆記錄。
+    """
+    points = await load_price_points(session, ram_id)
+    if not points:
         # 如果找不到任何價格紀錄，回傳 404 錯誤。
         raise HTTPException(status_code=404, detail="RAM not found or no price history")
-    return prices
+    return [
+        RamPriceResponse(price=row.price, status=row.status, scraped_at=row.scraped_at)
+        for row in points
+    ]
 
 
 @app.get("/ram/{ram_id}/chart-data", response_model=ChartDataResponse)
-async def get_chart_data(ram_id: int, session: AsyncSession = Depends(get_session)):
+async def get_chart_data(
+    ram_id: int, session: AsyncSession = Depends(get_read_session)
+):
     """
     根據指定的 ram_id，獲取為前端圖表準備的格式化資料。
-    若為追蹤項目，返回專屬表歷史；否則，返回最新單筆記錄。
-    """
-    # 檢查是否為追蹤項目
-    tracked = await session.get(TrackedRam, ram_id)
-    if tracked:
-        # 查詢專屬追蹤表
-        table_name = f"ram_{ram_id}_track"
-        result = await session.execute(
-            text(f"SELECT scraped_at, price FROM {table_name} ORDER BY scraped_at")
-        )
-        data = result.fetchall()
-    else:
-        # 查詢主表最新記錄
-        stmt = select(RamPrice.scraped_at, RamPrice.price).where(
-            RamPrice.ram_id == ram_id
-        )
-        result = await session.execute(stmt)
-        data = result.fetchall()
-
-    if not data:
+    若有累積歷史（追蹤項目或全部追蹤模式），返回各次價格變動與最新快照；否則，返回最新單筆記錄。
+    """
+    points = await load_price_points(session, ram_id)
+    if not points:
         raise HTTPException(status_code=404, detail="RAM not found or no chart data")
 
     # 將查詢結果的 (日期, 價格) 對，轉換成兩個獨立的列表，方便前端圖表庫使用。
-    dates = [d.strftime("%Y-%m-%d %H:%M") for d, _ in data]
-    prices = [p for _, p in data]
+    dates = [row.scraped_at.strftime("%Y-%m-%d %H:%M") for row in points]
+    prices = [row.price for row in points]
 
     return ChartDataResponse(dates=dates, prices=prices)
 
 
+@app.get("/tracking-mode", response_model=TrackingModeRequest)
+async def get_tracking_mode(session: AsyncSession = Depends(get_read_session)):
+    """取得全域追蹤模式。"""
+    return TrackingModeRequest(track_all=await get_track_all(session))
+
+
+@app.put("/tracking-mode", response_model=TrackingModeRequest)
+async def update_tracking_mode(
+    request: TrackingModeRequest, session: AsyncSession = Depends(get_session)
+):
+    """
+    設定全域追蹤模式。啟用 track_all 時，每次抓取都會為所有 RAM 記錄歷史價格，
+    不需逐一加入追蹤列表。
+    """
+    await set_track_all(session, request.track_all)
+    return request
+
+
+@app.post("/tracked-rams/bulk")
+async def bulk_add_to_tracked(
+    request: BulkTrackRequest, session: AsyncSession = Depends(get_session)
+):
+    """
+    批次加入追蹤：依 ram_ids 列表或欄位篩選（例如 category），以單一陳述式新增。
+    同時指定 ram_ids 與篩選條件時，只追蹤同時符合兩者的項目。
+    """
+    filters = request.model_dump(exclude={"ram_ids"})
+    try:
+        count = await track_rams(session, request.ram_ids, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Added to tracked", "count": count}
+
+
+@app.post("/tracked-rams/bulk-delete")
+async def bulk_remove_from_tracked(
+    request: BulkTrackRequest, session: AsyncSession = Depends(get_session)
+):
+    """
+    批次取消追蹤：依 ram_ids 列表或欄位篩選，以單一陳述式移除。
+    同時指定 ram_ids 與篩選條件時，只移除同時符合兩者的項目。
+    """
+    filters = request.model_dump(exclude={"ram_ids"})
+    try:
+        count = await untrack_rams(session, request.ram_ids, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Removed from tracked", "count": count}
+
+
 @app.post("/tracked-rams/{ram_id}")
 async def add_to_tracked(ram_id: int, session: AsyncSession = Depends(get_session)):
     """
     將指定的 ram_id 加入追蹤列表。若已存在，返回成功；否則新增。
     """
-    # 檢查是否已存在
-    existing = await session.get(TrackedRam, ram_id)
-    if existing:
+    count = await track_rams(session, [ram_id])
+    if not count:
         return {"message": "Already tracked", "ram_id": ram_id}
-
-    # 新增追蹤
-    tracked = TrackedRam(id=ram_id, ram_id=ram_id)
-    session.add(tracked)
-    await session.commit()
     return {"message": "Added to tracked", "ram_id": ram_id}
+
+
+@app.delete("/tracked-rams/{ram_id}")
+async def remove_from_tracked(
+    ram_id: int, session: AsyncSession = Depends(get_session)
+):
+    """
+    將指定的 ram_id 移出追蹤列表。
+    """
+    count = await untrack_rams(session, [ram_id])
+    if not count:
+        raise HTTPException(status_code=404, detail="RAM not tracked")
+    return {"message": "Removed from tracked", "ram_id": ram_id}
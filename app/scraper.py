@@ -1,11 +1,12 @@
-import aiohttp
 import asyncio
 import random
-from bs4 import BeautifulSoup
-from app.database import RamOption, RamPrice, TrackedRam, async_session
-from sqlalchemy import insert
+from app.database import RamOption, RamPrice, RamPriceHistory, get_write_queue
+from app.tracking import get_track_all, get_tracked_ids
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Tuple
+from datetime import datetime
 import re
 
 
@@ -13,6 +14,9 @@ RANDOM_INTERVALS = [3, 7, 5, 9, 2, 4, 6, 8, 11]
 
 
 async def fetch_html(url: str) -> str:
+    # Deferred so parsing/storage helpers don't pay for importing aiohttp
+    import aiohttp
+
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
@@ -53,6 +57,72 @@ def parse_option_text(text: str, category: str) -> Tuple[str, str, str, str, int
     return brand, capacity, speed, latency, price, status
 
 
+async def store_options(session: AsyncSession, options: List[tuple]):
+    # Batch all writes: one upsert for options, one for latest prices and one
+    # insert for history, instead of several round trips per option.
+    if not options:
+        return
+    scraped_at = datetime.utcnow()
+
+    # Previous snapshot, so history only records price/status changes
+    result = await session.execute(
+        select(RamPrice.ram_id, RamPrice.price, RamPrice.status)
+    )
+    previous = {ram_id: (price, status) for ram_id, price, status in result.all()}
+
+    option_rows = [
+        {
+            "id": value,
+            "name_raw": text,
+            "category": category,
+            "brand": brand,
+            "capacity": capacity,
+            "speed": speed,
+            "latency": latency,
+            "is_dual_channel": is_dual,
+            "created_at": scraped_at,
+        }
+        for value, text, category, brand, capacity, speed, latency, is_dual, _, _ in options
+    ]
+    stmt = insert(RamOption)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"], set_={"category": stmt.excluded.category}
+    )
+    await session.execute(stmt, option_rows)
+
+    price_rows = [
+        {"ram_id": value, "price": price, "status": status, "scraped_at": scraped_at}
+        for value, *_, price, status in options
+    ]
+    stmt = insert(RamPrice)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ram_id"],
+        set_={
+            "price": stmt.excluded.price,
+            "status": stmt.excluded.status,
+            "scraped_at": stmt.excluded.scraped_at,
+        },
+    )
+    await session.execute(stmt, price_rows)
+
+    # Append history for tracked options (or every option in track-all mode),
+    # only when price or status differs from the previous snapshot
+    if await get_track_all(session):
+        history_rows = price_rows
+    else:
+        tracked_ids = await get_tracked_ids(session)
+        history_rows = [row for row in price_rows if row["ram_id"] in tracked_ids]
+    history_rows = [
+        row
+        for row in history_rows
+        if previous.get(row["ram_id"]) != (row["price"], row["status"])
+    ]
+    if history_rows:
+        await session.execute(insert(RamPriceHistory), history_rows)
+
+    await session.commit()
+
+
 async def scrape_and_store():
     url = "https://www.coolpc.com.tw/evaluate.php"
 
@@ -60,6 +130,8 @@ async def scrape_and_store():
     interval = random.choice(RANDOM_INTERVALS)
     await asyncio.sleep(interval)
 
+    from bs4 import BeautifulSoup
+
     html_bytes = await fetch_html(url)
     soup = BeautifulSoup(html_bytes, "html.parser")
     select = soup.find("select", {"name": "n6"})
@@ -106,69 +178,9 @@ async def scrape_and_store():
                 )
             )
 
-    async with async_session() as session:
-        for (
-            value,
-            text,
-            category,
-            brand,
-            capacity,
-            speed,
-            latency,
-            is_dual,
-            price,
-            status,
-        ) in options:
-            # Upsert option
-            ram_option = await session.get(RamOption, value)
-            if not ram_option:
-                ram_option = RamOption(
-                    id=value,
-                    name_raw=text,
-                    category=category,
-                    brand=brand,
-                    capacity=capacity,
-                    speed=speed,
-                    latency=latency,
-                    is_dual_channel=is_dual,
-                )
-                session.add(ram_option)
-            else:
-                ram_option.category = category
-            # Upsert price entry
-            stmt = insert(RamPrice).values(
-                ram_id=value, price=price, status=status, scraped_at=datetime.utcnow()
-            )
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["ram_id"],
-                set_={
-                    "price": stmt.excluded.price,
-                    "status": stmt.excluded.status,
-                    "scraped_at": stmt.excluded.scraped_at,
-                },
-            )
-            await session.execute(stmt)
-
-            # Check if tracked, and insert to track table
-            tracked = await session.get(TrackedRam, value)
-            if tracked:
-                table_name = f"ram_{value}_track"
-                # Create table if not exists
-                await session.execute(f"""
-                    CREATE TABLE IF NOT EXISTS {table_name} (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        price INTEGER,
-                        status TEXT,
-                        scraped_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                # Insert price
-                await session.execute(
-                    f"INSERT INTO {table_name} (price, status) VALUES (?, ?)",
-                    (price, status),
-                )
-
-        await session.commit()
+    # Writes go through the single-writer queue so they never contend with
+    # other writers; API reads use separate connections under WAL.
+    await get_write_queue().submit(lambda session: store_options(session, options))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./ram_tracking.db"
+
+
+@dataclass(frozen=True)
+class StorageConfig:
+    """
+    SQLite 儲存設定。讀寫分離：寫入只用單一連線，讀取使用獨立連線池，
+    搭配 WAL 日誌模式讓 API 讀取不會被進行中的抓取寫入阻塞。
+    """
+
+    database_url: str = DEFAULT_DATABASE_URL
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"  # WAL 模式下 NORMAL 即可保證一致性
+    cache_size: int = -64000  # 負值單位為 KiB，約 64 MiB
+    mmap_size: int = 256 * 1024 * 1024
+    busy_timeout: int = 5000  # 毫秒
+    read_pool_size: int = 5
+    echo: bool = False
+
+    @classmethod
+    def from_env(cls) -> "StorageConfig":
+        """從環境變數讀取設定（KEYPROD_DATABASE_URL、KEYPROD_DB_ECHO 等）。"""
+        defaults = cls()
+        return cls(
+            database_url=os.environ.get("KEYPROD_DATABASE_URL", defaults.database_url),
+            journal_mode=os.environ.get("KEYPROD_DB_JOURNAL_MODE", defaults.journal_mode),
+            synchronous=os.environ.get("KEYPROD_DB_SYNCHRONOUS", defaults.synchronous),
+            cache_size=int(os.environ.get("KEYPROD_DB_CACHE_SIZE", defaults.cache_size)),
+            mmap_size=int(os.environ.get("KEYPROD_DB_MMAP_SIZE", defaults.mmap_size)),
+            read_pool_size=int(
+                os.environ.get("KEYPROD_DB_READ_POOL_SIZE", defaults.read_pool_size)
+            ),
+            echo=os.environ.get("KEYPROD_DB_ECHO", "") not in ("", "0", "false"),
+        )
+
+
+def _install_pragmas(engine: AsyncEngine, config: StorageConfig, read_only: bool):
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {int(config.busy_timeout)}")
+        cursor.execute(f"PRAGMA journal_mode = {config.journal_mode}")
+        cursor.execute(f"PRAGMA synchronous = {config.synchronous}")
+        cursor.execute(f"PRAGMA cache_size = {int(config.cache_size)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(config.mmap_size)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+
+def create_engines(config: StorageConfig) -> Tuple[AsyncEngine, AsyncEngine]:
+    """建立 (讀取引擎, 寫入引擎)。寫入引擎只有一條連線，確保同時只有一個寫入者。"""
+    writer = create_async_engine(
+        config.database_url, echo=config.echo, pool_size=1, max_overflow=0
+    )
+    reader = create_async_engine(
+        config.database_url,
+        echo=config.echo,
+        pool_size=config.read_pool_size,
+        max_overflow=0,
+    )
+    _install_pragmas(writer, config, read_only=False)
+    _install_pragmas(reader, config, read_only=True)
+    return reader, writer
+
+
+class WriteQueue:
+    """
+    單一寫入者佇列：所有提交的寫入工作依序在同一個背景任務中執行，
+    每個工作使用獨立的寫入 session，避免多個寫入交易互相等待鎖。
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        self._session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            job, future = await self._queue.get()
+            try:
+                async with self._session_factory() as session:
+                    result = await job(session)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def submit(self, job: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """將寫入工作排入佇列並等待其完成，回傳工作結果。"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        return await future
+
+    async def close(self):
+        """等待佇列中的工作完成後停止背景任務。"""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
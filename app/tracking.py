@@ -0,0 +1,158 @@
+from datetime import datetime
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import delete, exists, literal, select, true
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import (
+    AppSetting,
+    RamOption,
+    RamPrice,
+    RamPriceHistory,
+    TrackedRam,
+)
+
+
+TRACK_ALL_KEY = "track_all"
+
+# RamOption 欄位中可用於批次追蹤篩選的欄位
+FILTER_FIELDS = ("category", "brand", "capacity", "speed", "latency", "is_dual_channel")
+
+
+def _option_filter(filters: dict):
+    """將篩選條件轉換為 RamOption 的 WHERE 子句列表，忽略值為 None 的條件。"""
+    clauses = []
+    for field, value in filters.items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Unsupported filter field: {field}")
+        if value is not None:
+            clauses.append(getattr(RamOption, field) == value)
+    return clauses
+
+
+async def _seed_history(session: AsyncSession, condition) -> None:
+    """
+    將符合條件的 RAM 目前快照寫入歷史表，作為開始追蹤時的起點。
+    歷史表只記錄價格或狀態變動，若不先寫入起點，價格不變的項目將沒有歷史。
+    已有相同 scraped_at 紀錄者略過。
+    """
+    already_recorded = exists().where(
+        RamPriceHistory.ram_id == RamPrice.ram_id,
+        RamPriceHistory.scraped_at == RamPrice.scraped_at,
+    )
+    await session.execute(
+        insert(RamPriceHistory).from_select(
+            ["ram_id", "price", "status", "scraped_at"],
+            select(
+                RamPrice.ram_id, RamPrice.price, RamPrice.status, RamPrice.scraped_at
+            ).where(condition, ~already_recorded),
+        )
+    )
+
+
+async def get_tracked_ids(session: AsyncSession) -> Set[int]:
+    """取得所有個別追蹤的 ram_id。"""
+    result = await session.scalars(select(TrackedRam.ram_id))
+    return set(result.all())
+
+
+async def load_price_points(session: AsyncSession, ram_id: int):
+    """
+    取得指定 RAM 的價格點 (price, status, scraped_at)：歷史表只記錄價格或狀態變動，
+    因此在其後補上主表的最新快照，延伸到最近一次抓取。無歷史紀錄時只返回最新快照。
+    """
+    result = await session.execute(
+        select(RamPriceHistory.price, RamPriceHistory.status, RamPriceHistory.scraped_at)
+        .where(RamPriceHistory.ram_id == ram_id)
+        .order_by(RamPriceHistory.scraped_at)
+    )
+    points = list(result.all())
+
+    result = await session.execute(
+        select(RamPrice.price, RamPrice.status, RamPrice.scraped_at).where(
+            RamPrice.ram_id == ram_id
+        )
+    )
+    latest = result.first()
+    if latest and (not points or latest.scraped_at > points[-1].scraped_at):
+        points.append(latest)
+    return points
+
+
+async def track_rams(
+    session: AsyncSession,
+    ram_ids: Optional[Iterable[int]] = None,
+    **filters,
+) -> int:
+    """
+    以單一 INSERT 陳述式將多個 RAM 加入追蹤，已追蹤者略過。
+    可指定 ram_ids 列表、以 RamOption 欄位篩選（例如 category="桌上型記憶體 DDR5 雙通道"），
+    或兩者同時指定（取交集）。回傳新增的追蹤筆數。
+    """
+    now = datetime.utcnow()
+    clauses = _option_filter(filters)
+    if ram_ids is not None:
+        ram_ids = set(ram_ids)  # 可能是只能迭代一次的 generator
+    if ram_ids is not None and not clauses:
+        rows = [{"ram_id": ram_id, "created_at": now} for ram_id in ram_ids]
+        if not rows:
+            return 0
+        await _seed_history(session, RamPrice.ram_id.in_(ram_ids))
+        stmt = insert(TrackedRam).values(rows)
+    else:
+        if ram_ids is not None:
+            clauses.append(RamOption.id.in_(ram_ids))
+        if not clauses:
+            raise ValueError("Either ram_ids or at least one filter is required")
+        await _seed_history(
+            session, RamPrice.ram_id.in_(select(RamOption.id).where(*clauses))
+        )
+        stmt = insert(TrackedRam).from_select(
+            ["ram_id", "created_at"],
+            select(RamOption.id, literal(now)).where(*clauses),
+        )
+    stmt = stmt.on_conflict_do_nothing(index_elements=["ram_id"])
+    result = await session.execute(stmt)
+    await session.commit()
+    return result.rowcount
+
+
+async def untrack_rams(
+    session: AsyncSession,
+    ram_ids: Optional[Iterable[int]] = None,
+    **filters,
+) -> int:
+    """
+    以單一 DELETE 陳述式將多個 RAM 移出追蹤列表，回傳移除筆數。
+    ram_ids 與欄位篩選同時指定時取交集。
+    """
+    clauses = _option_filter(filters)
+    conditions = []
+    if ram_ids is not None:
+        conditions.append(TrackedRam.ram_id.in_(set(ram_ids)))
+    if clauses:
+        conditions.append(TrackedRam.ram_id.in_(select(RamOption.id).where(*clauses)))
+    if not conditions:
+        raise ValueError("Either ram_ids or at least one filter is required")
+    result = await session.execute(delete(TrackedRam).where(*conditions))
+    await session.commit()
+    return result.rowcount
+
+
+async def get_track_all(session: AsyncSession) -> bool:
+    """讀取全域「全部追蹤」模式設定。"""
+    setting = await session.get(AppSetting, TRACK_ALL_KEY)
+    return setting is not None and setting.value == "1"
+
+
+async def set_track_all(session: AsyncSession, enabled: bool) -> None:
+    """設定全域「全部追蹤」模式。啟用時，每次抓取都會為所有 RAM 記錄歷史價格。"""
+    if enabled:
+        await _seed_history(session, true())
+    stmt = insert(AppSetting).values(key=TRACK_ALL_KEY, value="1" if enabled else "0")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"], set_={"value": stmt.excluded.value}
+    )
+    await session.execute(stmt)
+    await session.commit()
@@ -0,0 +1,111 @@
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_read_session, get_session
+from app.storage import StorageConfig, create_engines
+
+
+DDR5_DUAL = "桌上型記憶體 DDR5 雙通道"
+DDR5_SINGLE = "桌上型記憶體 DDR5 單條"
+DDR4_SINGLE = "桌上型記憶體 DDR4 單條"
+
+
+def make_option(
+    ram_id,
+    category=DDR5_SINGLE,
+    brand="A",
+    capacity="16GB",
+    price=1000,
+    status="in_stock",
+    is_dual=False,
+):
+    """建立與抓取結果相同格式的選項 tuple（store_options 的輸入）。"""
+    return (
+        ram_id,
+        f"{brand} {capacity} RAM {ram_id}",
+        category,
+        brand,
+        capacity,
+        "DDR5-5600",
+        "CL40",
+        is_dual,
+        price,
+        status,
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def default_database(tmp_path_factory):
+    """讓預設引擎（app.database.get_engine 等）指向臨時資料庫，測試不會修改專案內的 ram_tracking.db。"""
+    path = tmp_path_factory.mktemp("db") / "default.db"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("KEYPROD_DATABASE_URL", f"sqlite+aiosqlite:///{path}")
+        yield
+
+
+@pytest.fixture
+def sample_options():
+    return [
+        make_option(1, DDR5_DUAL, "A", "32GB", 3000, is_dual=True),
+        make_option(2, DDR5_SINGLE, "B", "16GB", -99),
+        make_option(3, DDR4_SINGLE, "C", "16GB", 900, "out_of_stock"),
+    ]
+
+
+@pytest.fixture
+def storage_config(tmp_path):
+    return StorageConfig(database_url=f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest_asyncio.fixture
+async def engines(storage_config):
+    """臨時資料庫的 (讀取引擎, 寫入引擎)，已建立所有資料表。"""
+    reader, writer = create_engines(storage_config)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield reader, writer
+    await reader.dispose()
+    await writer.dispose()
+
+
+@pytest.fixture
+def engine(engines):
+    return engines[1]
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def api_client(engines, session_factory):
+    """以臨時資料庫的讀寫引擎覆寫 session 依賴的 API 用戶端。"""
+    from app.main import app
+
+    read_session = sessionmaker(
+        engines[0], class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    async def override_read_session():
+        async with read_session() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_read_session] = override_read_session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
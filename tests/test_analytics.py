@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+from app.analytics import (
+    category_price_index,
+    load_catalog,
+    load_history,
+    resample_prices,
+    rolling_drawdown,
+)
+from app.database import RamPriceHistory
+from app.scraper import store_options
+from tests.conftest import DDR4_SINGLE, DDR5_DUAL
+
+
+START = datetime(2026, 1, 1)
+HISTORY = [
+    # ram 1: 100 -> 120 -> 90 ; ram 3: 50 -> 55 -> 60
+    {"ram_id": 1, "price": 100, "status": "in_stock", "scraped_at": START},
+    {"ram_id": 1, "price": 120, "status": "in_stock", "scraped_at": START + timedelta(days=1)},
+    {"ram_id": 1, "price": 90, "status": "in_stock", "scraped_at": START + timedelta(days=2)},
+    {"ram_id": 3, "price": 50, "status": "in_stock", "scraped_at": START},
+    {"ram_id": 3, "price": 55, "status": "in_stock", "scraped_at": START + timedelta(days=1)},
+    {"ram_id": 3, "price": 60, "status": "in_stock", "scraped_at": START + timedelta(days=2)},
+]
+
+
+@pytest_asyncio.fixture
+async def populated(engine, session, sample_options):
+    await store_options(session, sample_options)
+    await session.execute(insert(RamPriceHistory), HISTORY)
+    await session.commit()
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_load_catalog_dtypes(populated):
+    df = await load_catalog(engine=populated)
+    assert len(df) == 3
+    assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+    assert df["latest_price"].dtype == "Int64"
+    assert pd.api.types.is_datetime64_any_dtype(df["scraped_at"])
+    # Missing price marker is loaded as NA
+    assert df.set_index("id").loc[2, "latest_price"] is pd.NA
+
+
+@pytest.mark.asyncio
+async def test_load_history_arrow_backend(populated):
+    pytest.importorskip("pyarrow")
+    df = await load_history(engine=populated, dtype_backend="pyarrow")
+    # Six history rows plus the latest snapshot of ram 1 and ram 3
+    assert len(df) == 8
+    assert df["price"].dtype == "int64[pyarrow]"
+
+
+@pytest.mark.asyncio
+async def test_load_history_filters(populated):
+    df = await load_history(category=DDR4_SINGLE, engine=populated)
+    assert set(df["ram_id"]) == {3}
+
+
+@pytest.mark.asyncio
+async def test_resample_and_category_index(populated):
+    history = await load_history(engine=populated)
+    wide = resample_prices(history, "1D")
+    assert list(wide.columns) == [1, 3]
+    assert wide.loc[START + timedelta(days=2), 1] == 90
+
+    index = category_price_index(history, "1D")
+    assert index.loc[START, DDR5_DUAL] == 100
+    assert index.loc[START + timedelta(days=2), DDR4_SINGLE] == 120
+
+
+@pytest.mark.asyncio
+async def test_rolling_drawdown(populated):
+    history = await load_history(engine=populated)
+    df = rolling_drawdown(history, "30D").set_index(["ram_id", "scraped_at"])
+    last = df.loc[(1, START + timedelta(days=2))]
+    assert last["rolling_max"] == 120
+    assert last["rolling_min"] == 90
+    assert last["drawdown"] == pytest.approx(90 / 120 - 1)
+
+
+@pytest.mark.asyncio
+async def test_load_history_since_keeps_price_in_effect(populated):
+    since = START + timedelta(days=1, hours=12)
+    df = await load_history(ram_ids=[1], since=since, engine=populated)
+    assert df["scraped_at"].iloc[0] == since
+    assert df["price"].tolist() == [120, 90, 3000]
+
+
+@pytest.mark.asyncio
+async def test_rolling_drawdown_gap_longer_than_window(engine, session, sample_options):
+    await store_options(session, sample_options)
+    await session.execute(
+        insert(RamPriceHistory),
+        [
+            {"ram_id": 1, "price": 100, "status": "in_stock", "scraped_at": START},
+            {"ram_id": 1, "price": 90, "status": "in_stock", "scraped_at": START + timedelta(days=40)},
+        ],
+    )
+    await session.commit()
+
+    history = await load_history(ram_ids=[1], engine=engine)
+    df = rolling_drawdown(history, "30D").set_index(["ram_id", "scraped_at"])
+    assert df.loc[(1, START + timedelta(days=40)), "drawdown"] == pytest.approx(-0.1)
@@ -3,18 +3,15 @@ import asyncio
 from fastapi.testclient import TestClient
 from app.main import app
 from app.database import init_db
-
-
-@pytest.fixture(scope="module")
-def event_loop():
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+from app.scraper import store_options
+from app.tracking import track_rams
+from tests.conftest import make_option
 
 
 @pytest.fixture(scope="module", autouse=True)
-def init_database(event_loop):
-    event_loop.run_until_complete(init_db())
+def init_database(default_database):
+    # Runs against the temporary database configured in conftest
+    asyncio.run(init_db())
 
 
 def test_get_ram_options():
@@ -34,3 +31,26 @@ def test_get_chart_data_not_found():
     client = TestClient(app)
     response = client.get("/ram/999/chart-data")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_price_history_records_changes_only(
+    api_client, session, sample_options
+):
+    await store_options(session, sample_options)
+    await track_rams(session, [1])
+    await store_options(session, sample_options)
+    await store_options(session, [make_option(1, price=2500)] + sample_options[1:])
+    await store_options(session, [make_option(1, price=2500)] + sample_options[1:])
+
+    # Seeded snapshot, the change, then the latest unchanged snapshot
+    response = await api_client.get("/ram/1/prices")
+    assert response.status_code == 200
+    assert [row["price"] for row in response.json()] == [3000, 2500, 2500]
+
+    response = await api_client.get("/ram/1/chart-data")
+    assert response.json()["prices"] == [3000, 2500, 2500]
+
+    # Untracked items return only the latest snapshot
+    response = await api_client.get("/ram/3/prices")
+    assert [row["price"] for row in response.json()] == [900]
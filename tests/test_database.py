@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.database import RamPrice, TrackedRam, init_db
+from app.scraper import store_options
+from app.storage import create_engines
+from app.tracking import get_tracked_ids
+
+
+# Schema of databases created before ram_prices/tracked_rams had unique ram_id
+LEGACY_SCHEMA = [
+    """CREATE TABLE ram_prices (
+        id INTEGER NOT NULL, ram_id INTEGER NOT NULL, price INTEGER NOT NULL,
+        status VARCHAR NOT NULL, scraped_at DATETIME NOT NULL, PRIMARY KEY (id))""",
+    """CREATE TABLE tracked_rams (
+        id INTEGER NOT NULL, ram_id INTEGER NOT NULL,
+        created_at DATETIME NOT NULL, PRIMARY KEY (id))""",
+    "INSERT INTO ram_prices (ram_id, price, status, scraped_at) VALUES "
+    "(1, 100, 'in_stock', '2026-01-01'), (1, 200, 'in_stock', '2026-01-02')",
+    "INSERT INTO tracked_rams (ram_id, created_at) VALUES "
+    "(1, '2026-01-01'), (1, '2026-01-02')",
+]
+
+
+@pytest.mark.asyncio
+async def test_init_db_migrates_legacy_schema(storage_config, sample_options):
+    # Not the conftest `engines` fixture: tables must start from the old schema
+    reader, writer = create_engines(storage_config)
+    async with writer.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.execute(text(statement))
+
+    await init_db(writer)
+    async with sessionmaker(writer, class_=AsyncSession)() as session:
+        # Duplicates collapsed: latest price kept, one tracked row per ram_id
+        assert await session.scalar(select(RamPrice.price)) == 200
+        count = await session.scalar(select(func.count()).select_from(TrackedRam))
+        assert count == 1
+
+        await store_options(session, sample_options)
+        await store_options(session, sample_options)
+        count = await session.scalar(select(func.count()).select_from(RamPrice))
+        assert count == len(sample_options)
+        assert await get_tracked_ids(session) == {1}
+
+    await reader.dispose()
+    await writer.dispose()
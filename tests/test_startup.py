@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from sqlalchemy import insert
+from app.database import RamPrice, TrackedRam
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import-time budgets in seconds (generous to absorb slow CI hosts)
+API_IMPORT_BUDGET = 2.0
+CLI_IMPORT_BUDGET = 0.2
+
+HEAVY_MODULES = ("aiohttp", "bs4", "pandas")
+
+
+def import_time(module: str):
+    """Run `python -X importtime -c "import <module>"` and return (seconds, modules)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, us, name = line[len("import time:") :].split("|")
+        cumulative[name.strip()] = int(us) / 1_000_000
+    return cumulative[module], set(cumulative)
+
+
+def test_cli_import_is_cheap():
+    seconds, modules = import_time("app.cli")
+    assert seconds < CLI_IMPORT_BUDGET
+    assert not {"sqlalchemy", *HEAVY_MODULES} & modules
+
+
+def test_api_import_skips_scraper_and_analytics():
+    seconds, modules = import_time("app.main")
+    assert seconds < API_IMPORT_BUDGET
+    assert not set(HEAVY_MODULES) & modules
+
+
+def test_database_import_does_not_build_engines():
+    code = "import app.database as db; assert db._engines.cache_info().currsize == 0"
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_cli_filter_fields_match_tracking():
+    from app import cli, tracking
+
+    assert cli.FILTER_FIELDS == tracking.FILTER_FIELDS
+
+
+def test_cli_parser():
+    from app.cli import build_parser
+
+    args = build_parser().parse_args(
+        ["track", "1", "2", "--category", "DDR5", "--no-dual-channel"]
+    )
+    assert args.ram_ids == [1, 2]
+    assert args.category == "DDR5"
+    assert args.is_dual_channel is False
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["history"])
+
+
+@pytest.mark.asyncio
+async def test_cli_history_labels_tracked_without_history(
+    storage_config, engines, session
+):
+    # Tracked row written directly: no history rows, only the latest snapshot
+    await session.execute(
+        insert(RamPrice).values(ram_id=248, price=1000, status="in_stock")
+    )
+    await session.execute(insert(TrackedRam).values(ram_id=248))
+    await session.commit()
+
+    env = {**os.environ, "KEYPROD_DATABASE_URL": storage_config.database_url}
+    result = subprocess.run(
+        [sys.executable, "-m", "app.cli", "history", "248"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "Tracked price history for RAM ID 248" in result.stdout
+    assert "not tracked" not in result.stdout
@@ -0,0 +1,89 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from app.scraper import store_options
+from app.storage import WriteQueue
+from app.tracking import set_track_all
+from tests.conftest import make_option
+
+
+N_OPTIONS = 2000
+MAX_READ_LATENCY = 1.0  # seconds
+LOCK_HOLD = 1.5  # seconds; longer than MAX_READ_LATENCY so a blocked read fails
+
+
+def make_options(price_offset=0):
+    return [
+        make_option(i, brand=f"Brand{i % 10}", price=1000 + i + price_offset)
+        for i in range(1, N_OPTIONS + 1)
+    ]
+
+
+@pytest_asyncio.fixture
+async def api(api_client, session_factory):
+    async with session_factory() as session:
+        await set_track_all(session, True)
+        await store_options(session, make_options())
+    return api_client
+
+
+@pytest.mark.asyncio
+async def test_pragmas_applied(engines):
+    reader, writer = engines
+    async with writer.connect() as conn:
+        assert (await conn.scalar(text("PRAGMA journal_mode"))) == "wal"
+        assert (await conn.scalar(text("PRAGMA synchronous"))) == 1  # NORMAL
+    async with reader.connect() as conn:
+        assert (await conn.scalar(text("PRAGMA query_only"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_write_queue_runs_jobs_in_order(session_factory):
+    queue = WriteQueue(session_factory)
+    order = []
+
+    async def job(session, n):
+        await asyncio.sleep(0.01 * (3 - n))
+        order.append(n)
+        return n
+
+    results = await asyncio.gather(
+        *(queue.submit(lambda session, n=n: job(session, n)) for n in range(3))
+    )
+    await queue.close()
+    assert results == [0, 1, 2]
+    assert order == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_reads_not_blocked_by_running_scrape(api, session_factory):
+    queue = WriteQueue(session_factory)
+    scraping = asyncio.Event()
+
+    async def scrape_job(session):
+        # Hold an exclusive write lock like a long scrape would. Without WAL
+        # this blocks every reader until commit; under WAL readers proceed.
+        for offset in range(2):
+            await store_options(session, make_options(offset))
+            await session.execute(text("BEGIN EXCLUSIVE"))
+            await session.execute(text("UPDATE ram_prices SET price = price"))
+            scraping.set()
+            await asyncio.sleep(LOCK_HOLD)
+            await session.commit()
+
+    latencies = []
+    scrape = asyncio.create_task(queue.submit(scrape_job))
+    await scraping.wait()
+    while not scrape.done():
+        started = time.perf_counter()
+        response = await api.get("/ram-options")
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+        assert len(response.json()) == N_OPTIONS
+    await scrape
+    await queue.close()
+
+    assert len(latencies) >= 3
+    assert max(latencies) < MAX_READ_LATENCY
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import func, select
+from app.database import RamPriceHistory, TrackedRam
+from app.scraper import store_options
+from app.tracking import (
+    get_track_all,
+    get_tracked_ids,
+    set_track_all,
+    track_rams,
+    untrack_rams,
+)
+from tests.conftest import DDR4_SINGLE, make_option
+
+
+async def _history_count(session):
+    return await session.scalar(select(func.count()).select_from(RamPriceHistory))
+
+
+@pytest.mark.asyncio
+async def test_track_by_ids_is_idempotent(session):
+    assert await track_rams(session, [1, 2]) == 2
+    assert await track_rams(session, [2, 3]) == 1
+    assert await get_tracked_ids(session) == {1, 2, 3}
+    count = await session.scalar(select(func.count()).select_from(TrackedRam))
+    assert count == 3
+
+
+@pytest.mark.asyncio
+async def test_track_and_untrack_by_filter(session, sample_options):
+    await store_options(session, sample_options)
+    assert await track_rams(session, capacity="16GB") == 2
+    assert await get_tracked_ids(session) == {2, 3}
+    assert await untrack_rams(session, category=DDR4_SINGLE) == 1
+    assert await get_tracked_ids(session) == {2}
+    with pytest.raises(ValueError):
+        await track_rams(session)
+
+
+@pytest.mark.asyncio
+async def test_ids_and_filter_are_combined(session, sample_options):
+    await store_options(session, sample_options)
+    assert await track_rams(session, [1, 2], category="zzz") == 0
+    assert await track_rams(session, [1, 2, 3], capacity="16GB") == 2
+    assert await get_tracked_ids(session) == {2, 3}
+    assert await untrack_rams(session, [1, 2], category=DDR4_SINGLE) == 0
+    assert await untrack_rams(session, [2, 3], category=DDR4_SINGLE) == 1
+    assert await get_tracked_ids(session) == {2}
+
+
+@pytest.mark.asyncio
+async def test_store_options_records_history_for_tracked(session, sample_options):
+    await store_options(session, sample_options)
+    assert await _history_count(session) == 0
+    # Tracking seeds history with the current snapshot
+    await track_rams(session, [1])
+    assert await _history_count(session) == 1
+    await store_options(session, sample_options)
+    assert await _history_count(session) == 1
+    assert 2 not in await get_tracked_ids(session)
+
+    # Only a price/status change appends another row
+    changed = [make_option(1, price=2500)] + sample_options[1:]
+    await store_options(session, changed)
+    assert await _history_count(session) == 2
+
+
+@pytest.mark.asyncio
+async def test_store_options_track_all(session, sample_options):
+    await set_track_all(session, True)
+    assert await get_track_all(session)
+    await store_options(session, sample_options)
+    # Unchanged prices on later scrapes don't grow the history
+    await store_options(session, sample_options)
+    await store_options(session, sample_options)
+    assert await _history_count(session) == len(sample_options)
+
+
+@pytest.mark.asyncio
+async def test_track_by_generator_seeds_history(session, sample_options):
+    await store_options(session, sample_options)
+    assert await track_rams(session, (i for i in [1, 3])) == 2
+    assert await _history_count(session) == 2